@@ -0,0 +1,89 @@
+import numpy as np
+from numba import njit
+from numba.types import Array, Tuple, boolean, float32, float64, int64
+
+# Read-only C-contiguous price series (pandas hands out read-only views)
+SWING_SIGNATURES = [
+    Tuple((int64[::1], boolean[::1]))(Array(dtype, 1, 'C', readonly=True), int64, int64, boolean)
+    for dtype in (float32, float64)
+]
+
+# Eager signatures: compiled (or loaded from the on-disk cache) once, at import
+@njit(SWING_SIGNATURES, cache=True, nogil=True)
+def detect_swings(values, left, right, is_high):
+    """
+    Find swing highs (is_high) or swing lows of one price series in a single forward scan,
+    using a monotonic queue for the rolling extreme over [i-left, i+right] and a running
+    extreme for the prior-extreme filter. Returns the swing indices and a mask flagging
+    the ones that sit below (above) an earlier high (low).
+    """
+    sign = 1.0 if is_high else -1.0
+    n = len(values)
+    swings = np.empty(n, dtype=np.int64)
+    mask = np.zeros(n, dtype=np.bool_)
+    queue = np.empty(n, dtype=np.int64)
+    head = tail = 0
+    n_swings = 0
+    prior = -np.inf
+
+    for j in range(n):
+        while tail > head and sign * values[queue[tail - 1]] <= sign * values[j]:
+            tail -= 1
+        queue[tail] = j
+        tail += 1
+
+        # Candle whose window closes at j
+        i = j - right
+        if i < 0:
+            continue
+        while queue[head] < i - left:
+            head += 1
+
+        value = sign * values[i]
+        if i >= left and value == sign * values[queue[head]]:
+            swings[n_swings] = i
+            mask[n_swings] = prior > value
+            n_swings += 1
+        prior = max(prior, value)
+
+    return swings[:n_swings], mask[:n_swings]
+
+# Block prices (float32 from the chart data, float64 for other callers) and the tolerance
+LEVEL_SIGNATURES = [
+    int64[::1](Array(dtype, 1, 'C', readonly=True), float64)
+    for dtype in (float32, float64)
+]
+
+@njit(LEVEL_SIGNATURES, cache=True, nogil=True)
+def assign_levels(prices, tolerance):
+    """
+    Group block prices into levels in block order: each price joins the earliest level whose
+    seed (first price) lies strictly within +-tolerance of it, otherwise it seeds a new level.
+    Seeds are kept sorted, so only the two seeds around a price need checking - seeds are
+    at least the tolerance apart, so no more than two fit in the open window. Returns the
+    level number of every price, with levels numbered in order of creation.
+    """
+    n = len(prices)
+    labels = np.empty(n, dtype=np.int64)
+    seeds = np.empty(n, dtype=np.float64)
+    seed_ids = np.empty(n, dtype=np.int64)
+    n_seeds = 0
+
+    for k in range(n):
+        price = np.float64(prices[k])
+        pos = np.searchsorted(seeds[:n_seeds], price)
+        level = -1
+        if pos > 0 and abs(seeds[pos - 1] - price) < tolerance:
+            level = seed_ids[pos - 1]
+        if pos < n_seeds and abs(seeds[pos] - price) < tolerance and (level < 0 or seed_ids[pos] < level):
+            level = seed_ids[pos]
+        if level < 0:
+            seeds[pos + 1:n_seeds + 1] = seeds[pos:n_seeds].copy()
+            seed_ids[pos + 1:n_seeds + 1] = seed_ids[pos:n_seeds].copy()
+            seeds[pos] = price
+            seed_ids[pos] = n_seeds
+            level = n_seeds
+            n_seeds += 1
+        labels[k] = level
+
+    return labels
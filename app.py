@@ -1,12 +1,16 @@
 import streamlit as st
-import yfinance as yf
 import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
-import pytz
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+from pathlib import Path
+import os
 import time
 
+from analysis_kernel import assign_levels, detect_swings
+from candle_store import load_range
+
 st.set_page_config(
     page_title="Smart S/R Finder Pro",
     layout="wide",
@@ -14,335 +18,18 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-TEHRAN_TZ = pytz.timezone('Asia/Tehran')
+TEHRAN_TZ = ZoneInfo('Asia/Tehran')
+MAX_CANDLES = 3000  # Candles drawn before the chart is bucketed
+LEVEL_TINTS = {'Support': 'rgba(76, 201, 240, 0.2)', 'Resistance': 'rgba(247, 37, 133, 0.2)'}  # Type cell backgrounds
+CACHE_DIR = Path.home() / '.sm_cache'  # On-disk candle store, survives restarts
 
 # --- Custom CSS for enhanced styling ---
-st.markdown("""
-<style>
-    /* Enhanced Main styling with better gradients */
-    [data-testid="stAppViewContainer"] {
-        background: linear-gradient(135deg, #0f0f23 0%, #1a1a2e 25%, #16213e 50%, #0f3460 75%, #533483 100%);
-        color: #e6e6e6;
-        transition: all 0.8s cubic-bezier(0.4, 0, 0.2, 1);
-        min-height: 100vh;
-    }
-    
-    /* Enhanced Header styling with glassmorphism */
-    .header {
-        background: linear-gradient(135deg, rgba(10, 15, 35, 0.9) 0%, rgba(67, 97, 238, 0.1) 100%);
-        backdrop-filter: blur(20px);
-        border-radius: 20px;
-        padding: 30px;
-        box-shadow: 0 8px 32px rgba(0, 0, 0, 0.4), 0 0 0 1px rgba(76, 201, 240, 0.2);
-        margin-bottom: 30px;
-        border: 1px solid rgba(76, 201, 240, 0.3);
-        transition: all 0.6s cubic-bezier(0.4, 0, 0.2, 1);
-        position: relative;
-        overflow: hidden;
-    }
-    
-    .header::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: -100%;
-        width: 100%;
-        height: 100%;
-        background: linear-gradient(90deg, transparent, rgba(76, 201, 240, 0.1), transparent);
-        animation: shimmer 3s infinite;
-    }
-    
-    @keyframes shimmer {
-        0% { left: -100%; }
-        100% { left: 100%; }
-    }
-    
-    /* Enhanced Card styling with 3D effects */
-    .card {
-        background: linear-gradient(135deg, rgba(20, 25, 45, 0.9) 0%, rgba(67, 97, 238, 0.1) 100%) !important;
-        backdrop-filter: blur(15px);
-        border-radius: 20px;
-        padding: 25px;
-        margin-bottom: 25px;
-        box-shadow: 0 10px 30px rgba(0, 0, 0, 0.3), 0 0 0 1px rgba(67, 97, 238, 0.2);
-        border: 1px solid rgba(67, 97, 238, 0.3);
-        transition: all 0.5s cubic-bezier(0.4, 0, 0.2, 1);
-        position: relative;
-        overflow: hidden;
-    }
-    
-    .card::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: 0;
-        right: 0;
-        height: 2px;
-        background: linear-gradient(90deg, #4361ee, #4cc9f0, #f72585);
-        transform: scaleX(0);
-        transition: transform 0.5s ease;
-    }
-    
-    .card:hover {
-        transform: translateY(-8px) scale(1.02);
-        box-shadow: 0 15px 40px rgba(67, 97, 238, 0.4), 0 0 0 2px rgba(76, 201, 240, 0.3);
-    }
-    
-    .card:hover::before {
-        transform: scaleX(1);
-    }
-    
-    /* Enhanced Button styling with gradient and glow */
-    .stButton>button {
-        background: linear-gradient(45deg, #4361ee, #4cc9f0, #f72585) !important;
-        background-size: 200% 200% !important;
-        border: none !important;
-        color: white !important;
-        border-radius: 12px !important;
-        padding: 12px 28px !important;
-        font-weight: 700 !important;
-        font-size: 16px !important;
-        transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1) !important;
-        width: 100%;
-        position: relative;
-        overflow: hidden;
-        box-shadow: 0 4px 15px rgba(67, 97, 238, 0.4);
-    }
-    
-    .stButton>button::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: -100%;
-        width: 100%;
-        height: 100%;
-        background: linear-gradient(90deg, transparent, rgba(255, 255, 255, 0.2), transparent);
-        transition: left 0.5s;
-    }
-    
-    .stButton>button:hover {
-        transform: translateY(-2px) scale(1.05);
-        box-shadow: 0 8px 25px rgba(67, 97, 238, 0.6), 0 0 20px rgba(76, 201, 240, 0.4);
-        background-position: right center !important;
-    }
-    
-    .stButton>button:hover::before {
-        left: 100%;
-    }
-    
-    /* Enhanced Input styling with glow effects */
-    .stTextInput>div>div>input, 
-    .stSelectbox>div>div>select,
-    .stDateInput>div>div>input,
-    .stTimeInput>div>div>input,
-    .stNumberInput>div>div>input {
-        background: linear-gradient(135deg, rgba(30, 35, 55, 0.9) 0%, rgba(67, 97, 238, 0.1) 100%) !important;
-        color: white !important;
-        border-radius: 12px !important;
-        border: 2px solid rgba(67, 97, 238, 0.3) !important;
-        transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1);
-        backdrop-filter: blur(10px);
-        box-shadow: 0 4px 15px rgba(0, 0, 0, 0.2);
-    }
-    
-    .stTextInput>div>div>input:focus, 
-    .stSelectbox>div>div>select:focus,
-    .stDateInput>div>div>input:focus,
-    .stTimeInput>div>div>input:focus,
-    .stNumberInput>div>div>input:focus {
-        border-color: #4cc9f0 !important;
-        box-shadow: 0 0 20px rgba(76, 201, 240, 0.4), 0 4px 15px rgba(0, 0, 0, 0.3) !important;
-        transform: scale(1.02);
-    }
-    
-    /* Enhanced Metric styling with 3D cards */
-    [data-testid="metric-container"] {
-        background: linear-gradient(135deg, rgba(20, 25, 45, 0.9) 0%, rgba(76, 201, 240, 0.1) 100%) !important;
-        backdrop-filter: blur(15px);
-        border: 2px solid rgba(76, 201, 240, 0.3) !important;
-        border-radius: 15px;
-        padding: 20px !important;
-        transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1);
-        box-shadow: 0 8px 25px rgba(0, 0, 0, 0.3);
-        position: relative;
-        overflow: hidden;
-    }
-    
-    [data-testid="metric-container"]::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: 0;
-        right: 0;
-        height: 3px;
-        background: linear-gradient(90deg, #4361ee, #4cc9f0);
-    }
-    
-    [data-testid="metric-container"]:hover {
-        transform: translateY(-5px);
-        box-shadow: 0 12px 35px rgba(76, 201, 240, 0.3);
-    }
-    
-    /* Enhanced Table styling with glassmorphism */
-    .dataframe {
-        background: linear-gradient(135deg, rgba(20, 25, 45, 0.9) 0%, rgba(67, 97, 238, 0.05) 100%) !important;
-        color: white !important;
-        border-radius: 15px;
-        transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1);
-        backdrop-filter: blur(10px);
-        border: 1px solid rgba(67, 97, 238, 0.2);
-        overflow: hidden;
-    }
-    
-    .dataframe th {
-        background: linear-gradient(135deg, rgba(67, 97, 238, 0.6) 0%, rgba(76, 201, 240, 0.3) 100%) !important;
-        color: white !important;
-        font-weight: 700 !important;
-        transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1);
-        border-bottom: 2px solid rgba(76, 201, 240, 0.3);
-    }
-    
-    .dataframe td {
-        background: linear-gradient(135deg, rgba(30, 35, 55, 0.6) 0%, rgba(67, 97, 238, 0.05) 100%) !important;
-        transition: all 0.3s ease;
-        border-bottom: 1px solid rgba(67, 97, 238, 0.1);
-    }
-    
-    .dataframe tr:hover td {
-        background: linear-gradient(135deg, rgba(76, 201, 240, 0.1) 0%, rgba(67, 97, 238, 0.05) 100%) !important;
-        transform: scale(1.01);
-    }
-    
-    /* Enhanced Tab styling with modern design */
-    [data-baseweb="tab-list"] {
-        gap: 15px !important;
-        background: linear-gradient(135deg, rgba(20, 25, 45, 0.8) 0%, rgba(67, 97, 238, 0.1) 100%);
-        border-radius: 15px;
-        padding: 10px;
-        backdrop-filter: blur(15px);
-        border: 1px solid rgba(67, 97, 238, 0.2);
-    }
-    
-    [data-baseweb="tab"] {
-        background: linear-gradient(135deg, rgba(30, 35, 55, 0.8) 0%, rgba(67, 97, 238, 0.1) 100%) !important;
-        border-radius: 12px !important;
-        padding: 12px 24px !important;
-        margin: 0 8px !important;
-        transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1);
-        border: 2px solid rgba(67, 97, 238, 0.2) !important;
-        backdrop-filter: blur(10px);
-        font-weight: 600;
-        position: relative;
-        overflow: hidden;
-    }
-    
-    [data-baseweb="tab"]::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: -100%;
-        width: 100%;
-        height: 100%;
-        background: linear-gradient(90deg, transparent, rgba(76, 201, 240, 0.1), transparent);
-        transition: left 0.5s;
-    }
-    
-    [data-baseweb="tab"]:hover {
-        background: linear-gradient(135deg, rgba(67, 97, 238, 0.3) 0%, rgba(76, 201, 240, 0.1) 100%) !important;
-        transform: translateY(-2px);
-        box-shadow: 0 6px 20px rgba(67, 97, 238, 0.3);
-    }
-    
-    [data-baseweb="tab"]:hover::before {
-        left: 100%;
-    }
-    
-    [aria-selected="true"] {
-        background: linear-gradient(45deg, #4361ee, #4cc9f0, #f72585) !important;
-        background-size: 200% 200% !important;
-        font-weight: 700 !important;
-        transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1);
-        box-shadow: 0 6px 20px rgba(67, 97, 238, 0.4);
-        border-color: rgba(76, 201, 240, 0.5) !important;
-        animation: gradientShift 3s ease infinite;
-    }
-    
-    @keyframes gradientShift {
-        0% { background-position: 0% 50%; }
-        50% { background-position: 100% 50%; }
-        100% { background-position: 0% 50%; }
-    }
-    
-    /* Enhanced Crypto icons with glow */
-    .crypto-icon {
-        width: 28px;
-        height: 28px;
-        margin-right: 12px;
-        vertical-align: middle;
-        display: inline-block;
-        transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1);
-        filter: drop-shadow(0 2px 8px rgba(76, 201, 240, 0.3));
-    }
-    
-    .crypto-icon:hover {
-        transform: scale(1.2) rotate(5deg);
-        filter: drop-shadow(0 4px 12px rgba(76, 201, 240, 0.6));
-    }
-    
-    /* Custom scrollbar */
-    ::-webkit-scrollbar {
-        width: 8px;
-        height: 8px;
-    }
-    
-    ::-webkit-scrollbar-track {
-        background: rgba(20, 25, 45, 0.5);
-        border-radius: 10px;
-    }
-    
-    ::-webkit-scrollbar-thumb {
-        background: linear-gradient(45deg, #4361ee, #4cc9f0);
-        border-radius: 10px;
-        transition: all 0.3s ease;
-    }
-    
-    ::-webkit-scrollbar-thumb:hover {
-        background: linear-gradient(45deg, #4cc9f0, #f72585);
-    }
-    
-    /* Loading animation */
-    .loading-pulse {
-        animation: pulse 2s cubic-bezier(0.4, 0, 0.6, 1) infinite;
-    }
-    
-    @keyframes pulse {
-        0%, 100% { opacity: 1; }
-        50% { opacity: 0.5; }
-    }
-    
-    /* Floating elements animation */
-    .floating {
-        animation: floating 3s ease-in-out infinite;
-    }
-    
-    @keyframes floating {
-        0% { transform: translateY(0px); }
-        50% { transform: translateY(-10px); }
-        100% { transform: translateY(0px); }
-    }
-    
-    /* Glow text effect */
-    .glow-text {
-        text-shadow: 0 0 10px rgba(76, 201, 240, 0.8), 0 0 20px rgba(76, 201, 240, 0.4);
-        animation: glow 2s ease-in-out infinite alternate;
-    }
-    
-    @keyframes glow {
-        from { text-shadow: 0 0 10px rgba(76, 201, 240, 0.8), 0 0 20px rgba(76, 201, 240, 0.4); }
-        to { text-shadow: 0 0 15px rgba(76, 201, 240, 1), 0 0 25px rgba(76, 201, 240, 0.6); }
-    }
-</style>
-""", unsafe_allow_html=True)
+@st.cache_resource
+def load_css():
+    """Read the app stylesheet once per process."""
+    return (Path(__file__).parent / 'assets' / 'style.css').read_text(encoding='utf-8')
+
+st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
 
 # --- from utils.py ---
 def validate_dates(start: datetime, end: datetime):
@@ -353,32 +40,98 @@ def validate_dates(start: datetime, end: datetime):
 
 def to_tehran_utc(start: datetime, end: datetime):
     """Convert input dates to Tehran timezone and then to UTC for data download."""
-    start_utc = TEHRAN_TZ.localize(start).astimezone(pytz.UTC)
-    end_utc = TEHRAN_TZ.localize(end).astimezone(pytz.UTC)
+    start_utc = start.replace(tzinfo=TEHRAN_TZ).astimezone(timezone.utc)
+    end_utc = end.replace(tzinfo=TEHRAN_TZ).astimezone(timezone.utc)
     return start_utc, end_utc
 
+@st.cache_resource
+def yf_session():
+    """Shared HTTP session so repeated downloads reuse pooled connections."""
+    from curl_cffi import requests as curl_requests
+    return curl_requests.Session(impersonate="chrome")
+
+def fetch_ohlc(symbol, start_utc, end_utc, interval, auto_adjust):
+    """Download one span of candles from yfinance, indexed in Tehran time."""
+    import yfinance as yf
+    from yfinance import shared
+    df = yf.download(
+        tickers=symbol,
+        start=start_utc,
+        end=end_utc,
+        interval=interval,
+        auto_adjust=auto_adjust,
+        progress=False,
+        session=yf_session()
+    )
+    # yfinance logs failed or throttled tickers instead of raising; a span the
+    # market was closed for is only reported as missing prices, which is not a failure
+    error = shared._ERRORS.get(symbol.upper())
+    if error and 'no price data found' not in error:
+        raise RuntimeError(f"Download of {symbol} failed: {error}")
+    if df.empty:
+        return df
+    df.dropna(inplace=True)
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.droplevel(1)
+    df.index = df.index.tz_convert(TEHRAN_TZ)
+    return df
+
 @st.cache_data(ttl=60*15)  # Cache for 15 minutes
 def download_data(symbol, start_utc, end_utc, interval, auto_adjust):
-    """Cache data download from yfinance."""
+    """
+    Cache data download from yfinance. Candles are also kept on disk per
+    (symbol, interval), so only the part of the range not stored yet is fetched.
+    Returns the candles and the requested spans that came back empty.
+    """
+    path = CACHE_DIR / symbol / f"{interval}_{'adj' if auto_adjust else 'raw'}.parquet"
+    start, end = pd.Timestamp(start_utc), pd.Timestamp(end_utc)
     with st.spinner(f'📡 Downloading {symbol} data...'):
-        df = yf.download(
-            tickers=symbol,
-            start=start_utc,
-            end=end_utc,
-            interval=interval,
-            auto_adjust=auto_adjust,
-            progress=False
+        df, missing = load_range(
+            path, start, end,
+            lambda s, e: fetch_ohlc(symbol, s, e, interval, auto_adjust),
+            TIMEFRAME_MINUTES.get(interval, 60)
         )
     if df.empty:
         st.error(f"❌ No data found for {symbol} in the selected time range")
         st.stop()
-    df.dropna(inplace=True)
-    if isinstance(df.columns, pd.MultiIndex):
-        df.columns = df.columns.droplevel(1)
-    df.index = df.index.tz_convert(TEHRAN_TZ)
-    return df
+    # Single precision is plenty for the swing scan and the chart
+    return df.astype({col: np.float32 for col in ('Open', 'High', 'Low', 'Close')}), missing
 
 # --- from analysis.py ---
+def downsample_ohlc(df: pd.DataFrame, max_bars: int) -> pd.DataFrame:
+    """Aggregate consecutive candles into at most max_bars OHLC buckets."""
+    if len(df) <= max_bars:
+        return df
+    starts = np.linspace(0, len(df), max_bars, endpoint=False).astype(int)
+    ends = np.append(starts[1:], len(df)) - 1
+    return pd.DataFrame({
+        'Open': df['Open'].values[starts],
+        'High': np.maximum.reduceat(df['High'].values, starts),
+        'Low': np.minimum.reduceat(df['Low'].values, starts),
+        'Close': df['Close'].values[ends],
+    }, index=df.index[starts])
+
+def frame_fingerprint(df: pd.DataFrame):
+    """Cheap cache key for an OHLC frame: shape, time span and OHLC checksums."""
+    if df.empty:
+        return (df.shape, tuple(df.columns))
+    return (
+        df.shape,
+        tuple(df.columns),
+        df.index[0].value,
+        df.index[-1].value,
+        float(df['Open'].sum()),
+        float(df['High'].sum()),
+        float(df['Low'].sum()),
+        float(df['Close'].sum()),
+    )
+
+@st.cache_resource
+def swing_executor():
+    """Worker threads for the GIL-free swing kernel, shared by all sessions."""
+    return ThreadPoolExecutor(max_workers=os.cpu_count() or 2)
+
+@st.cache_data(ttl=60*15, show_spinner=False, hash_funcs={pd.DataFrame: frame_fingerprint})
 def plot_smart_money_sr(
     symbol: str,
     df: pd.DataFrame,
@@ -388,122 +141,115 @@ def plot_smart_money_sr(
 ):
     """
     Analyze smart support and resistance points based on swings and plot candlestick chart with annotation.
+    Results are cached per parameter set; the figure is returned as a JSON string.
     """
-    highs = df['High'].values
-    lows  = df['Low'].values
-    
-    # Swing highs and lows
-    swing_highs = [i for i in range(left, len(highs) - right) if highs[i] == highs[i-left:i+right+1].max()]
-    swing_lows  = [i for i in range(left, len(lows) - right) if lows[i] == lows[i-left:i+right+1].min()]
+    import plotly.graph_objects as go
+    highs = np.ascontiguousarray(df['High'].values)
+    lows  = np.ascontiguousarray(df['Low'].values)
+    closes = df['Close'].values
+    
+    # Swing highs/lows and the prior-extreme filter, scanned concurrently
+    pool = swing_executor()
+    high_job = pool.submit(detect_swings, highs, left, right, True)
+    low_job = pool.submit(detect_swings, lows, left, right, False)
+    swing_highs, res_mask = high_job.result()
+    swing_lows, sup_mask = low_job.result()
+    res_idx = swing_highs[res_mask]
+    sup_idx = swing_lows[sup_mask]
 
-    blocks = []
-    block_details = []
-    for idx in swing_highs:
-        if idx > 0 and np.max(highs[:idx]) > highs[idx]:
-            blocks.append(('resistance', idx))
-            block_details.append({
-                'Date': df.index[idx].strftime('%Y-%m-%d'),
-                'Time': df.index[idx].strftime('%H:%M'),
-                'Type': 'Resistance',
-                'Price': df['High'].iloc[idx],
-                'Candle': idx
-            })
-    for idx in swing_lows:
-        if idx > 0 and np.min(lows[:idx]) < lows[idx]:
-            blocks.append(('support', idx))
-            block_details.append({
-                'Date': df.index[idx].strftime('%Y-%m-%d'),
-                'Time': df.index[idx].strftime('%H:%M'),
-                'Type': 'Support',
-                'Price': df['Low'].iloc[idx],
-                'Candle': idx
-            })
+    # Block columns, resistances first then supports
+    block_idx = np.concatenate([res_idx, sup_idx])
+    is_res = np.arange(len(block_idx)) < len(res_idx)
+    block_prices = np.where(is_res, highs[block_idx], lows[block_idx])
+    block_times = df.index[block_idx]
 
     # Create figure
     fig = go.Figure()
     
-    # Add candlesticks with gradient colors
+    # Add candlesticks with gradient colors (bucketed for long histories;
+    # swing detection above always uses the full-resolution data)
+    candles = downsample_ohlc(df, MAX_CANDLES)
     fig.add_trace(go.Candlestick(
-        x=df.index,
-        open=df['Open'], high=df['High'],
-        low=df['Low'], close=df['Close'],
+        x=candles.index,
+        open=candles['Open'], high=candles['High'],
+        low=candles['Low'], close=candles['Close'],
         name='Price',
         increasing_line_color='#2ecc71',  # Green
         decreasing_line_color='#e74c3c'   # Red
     ))
     
-    # Add support/resistance annotations
-    for kind, idx in blocks:
-        ts = df.index[idx]
-        high = df['High'].iloc[idx]
-        low = df['Low'].iloc[idx]
-        height = high - low
-        offset_ratio = 0.2
-        
-        if kind == 'resistance':
-            y = high + height * offset_ratio
-            ay = -20
-            arrow_color = "#f72585"  # Vibrant pink
-            annotation_text = "RES"
-        else:
-            y = low - height * offset_ratio
-            ay = 20
-            arrow_color = "#4cc9f0"   # Bright teal
-            annotation_text = "SUP"
-
-        fig.add_annotation(
+    # Add support/resistance annotations (collected, then set in one update)
+    block_highs, block_lows = highs[block_idx], lows[block_idx]
+    offset = (block_highs - block_lows) * 0.2
+    label_ys = np.where(is_res, block_highs + offset, block_lows - offset)
+    kind_style = {
+        True: dict(ay=-20, yanchor='bottom', arrowcolor="#f72585", bordercolor="#f72585", text="RES"),  # Vibrant pink
+        False: dict(ay=20, yanchor='top', arrowcolor="#4cc9f0", bordercolor="#4cc9f0", text="SUP"),  # Bright teal
+    }
+    annotations = [
+        dict(
             x=ts,
             y=y,
-            ax=0, ay=ay,
-            xanchor='center', 
-            yanchor='bottom' if kind=='resistance' else 'top',
+            ax=0,
+            xanchor='center',
             showarrow=True,
             arrowhead=3,
             arrowsize=1.5,
             arrowwidth=2,
-            arrowcolor=arrow_color,
             standoff=10,
             opacity=0.9,
             bgcolor='rgba(10, 15, 35, 0.7)',
-            bordercolor=arrow_color,
             borderwidth=1.5,
-            text=annotation_text,
-            font=dict(color='white', size=10)
+            font=dict(color='white', size=10),
+            **kind_style[bool(resistance)]
         )
+        for resistance, ts, y in zip(is_res, block_times, label_ys)
+    ]
+    fig.update_layout(annotations=annotations)
         
     # Add dynamic trend lines for support/resistance clusters
-    if block_details:
-        levels = {}
-        tolerance = 0.01 * df['Close'].mean()  # 1% tolerance
+    if len(block_idx):
+        tolerance = 0.01 * closes.mean(dtype=np.float64)  # 1% tolerance
+        
+        # Each block joins the earliest level seeded within +-tolerance of its price
+        labels = assign_levels(block_prices, tolerance)
+        
+        # Per-level aggregates over the contiguous runs of the label-sorted order:
+        # touch count, seed block (which sets kind and price) and time span
+        order = np.argsort(labels, kind='stable')
+        starts = np.flatnonzero(np.diff(labels[order], prepend=-1))
+        counts = np.diff(np.append(starts, len(order)))
+        first = np.minimum.reduceat(order, starts)
+        sorted_times = block_times.tz_convert(None).values[order]
+        span_start = pd.DatetimeIndex(np.minimum.reduceat(sorted_times, starts)).tz_localize('UTC').tz_convert(block_times.tz)
+        span_end = pd.DatetimeIndex(np.maximum.reduceat(sorted_times, starts)).tz_localize('UTC').tz_convert(block_times.tz)
         
-        for b in block_details:
-            price = b['Price']
-            found = False
-            for level in levels:
-                if abs(level - price) < tolerance:
-                    levels[level].append(b)
-                    found = True
-                    break
-            if not found:
-                levels[price] = [b]
+        # Only plot significant levels (with at least 2 touches), batched into
+        # one WebGL line trace per kind with None gaps between segments
+        segments = {}
+        for resistance in (True, False):
+            sel = np.flatnonzero((counts >= 2) & (is_res[first] == resistance))
+            prices = block_prices[first[sel]]
+            segments[resistance] = (
+                [x for k in sel for x in (span_start[k], span_end[k], None)],
+                [y for price in prices for y in (price, price, None)],
+            )
         
-        # Only plot significant levels (with at least 2 touches)
-        for price, blocks in levels.items():
-            if len(blocks) >= 2:
-                min_date = min([datetime.strptime(b['Date'] + ' ' + b['Time'], '%Y-%m-%d %H:%M') for b in blocks])
-                max_date = max([datetime.strptime(b['Date'] + ' ' + b['Time'], '%Y-%m-%d %H:%M') for b in blocks])
-                
-                fig.add_shape(
-                    type="line",
-                    x0=min_date, y0=price,
-                    x1=max_date, y1=price,
+        for resistance, (xs, ys) in segments.items():
+            if xs:
+                fig.add_trace(go.Scattergl(
+                    x=xs, y=ys,
+                    mode='lines',
+                    connectgaps=False,
                     line=dict(
-                        color="#4361ee" if blocks[0]['Type'] == 'Support' else "#f72585",
+                        color="#f72585" if resistance else "#4361ee",
                         width=2,
                         dash="dashdot",
                     ),
-                    opacity=0.7
-                )
+                    opacity=0.7,
+                    hoverinfo='skip',
+                    showlegend=False
+                ))
     
     # Layout configuration
     fig.update_layout(
@@ -515,6 +261,7 @@ def plot_smart_money_sr(
         yaxis_title="Price",
         xaxis_rangeslider_visible=False,
         template="plotly_dark",
+        uirevision=f"{symbol}-{interval}",
         dragmode='zoom',
         hovermode='x unified',
         height=700,
@@ -547,12 +294,35 @@ def plot_smart_money_sr(
         linecolor='#4cc9f0'
     )
     
-    # Create DataFrame from block details
-    df_blocks = pd.DataFrame(block_details)
-    if not df_blocks.empty:
-        df_blocks = df_blocks.sort_values(by=['Date', 'Time'])
-        df_blocks = df_blocks[['Date', 'Time', 'Type', 'Price', 'Candle']]
-    return fig, df_blocks
+    # Create DataFrame from the block columns, in chronological order
+    chrono = np.argsort(block_idx, kind='stable')
+    table_times = block_times[chrono]
+    df_blocks = pd.DataFrame({
+        'Date': table_times.strftime('%Y-%m-%d'),
+        'Time': table_times.strftime('%H:%M'),
+        'Type': pd.Categorical(np.where(is_res[chrono], 'Resistance', 'Support'), categories=['Support', 'Resistance']),
+        'Price': block_prices[chrono].astype(np.float32),
+        'Candle': block_idx[chrono].astype(np.int32),
+    })
+    return fig.to_json(), df_blocks
+
+def levels_table_html(df_blocks: pd.DataFrame) -> str:
+    """Render the S/R levels as a static HTML table, with the Type cells tinted by kind."""
+    tints = df_blocks['Type'].map(LEVEL_TINTS)
+    header = ''.join(f'<th>{col}</th>' for col in df_blocks.columns)
+    rows = ''.join(
+        f'<tr><td>{date}</td><td>{time_}</td><td style="background:{tint} !important">{kind}</td>'
+        f'<td>{price:.2f}</td><td>{candle}</td></tr>'
+        for date, time_, kind, price, candle, tint in zip(
+            df_blocks['Date'], df_blocks['Time'], df_blocks['Type'],
+            df_blocks['Price'], df_blocks['Candle'], tints
+        )
+    )
+    return (
+        '<div class="levels-table">'
+        f'<table class="dataframe"><thead><tr>{header}</tr></thead><tbody>{rows}</tbody></table>'
+        '</div>'
+    )
 
 CONFIG = {
     "scrollZoom": True,
@@ -584,6 +354,9 @@ DEFAULTS = {
     '4h': {'left': 3, 'right': 3, 'days': 30}
 }
 
+# Minutes per candle for each timeframe
+TIMEFRAME_MINUTES = {'1m': 1, '5m': 5, '15m': 15, '30m': 30, '1h': 60, '4h': 240}
+
 # Comprehensive asset database
 ASSET_DATABASE = {
     "Cryptocurrencies": {
@@ -646,11 +419,8 @@ ASSET_DATABASE = {
     }
 }
 
-# --- Page Configuration ---
-# (Removed duplicate st.set_page_config block here)
-
-# --- Enhanced Header ---
-st.markdown("""
+# Static header markup
+HEADER_HTML = """
 <div class="header">
     <div style="text-align:center; position:relative;">
         <div style="position:absolute; top:-20px; left:50%; transform:translateX(-50%); width:60px; height:60px; background:linear-gradient(45deg, #4361ee, #4cc9f0); border-radius:50%; display:flex; align-items:center; justify-content:center; box-shadow:0 8px 25px rgba(76, 201, 240, 0.4);">
@@ -672,7 +442,170 @@ st.markdown("""
         </div>
     </div>
 </div>
-""", unsafe_allow_html=True)
+"""
+
+# Static About tab markup
+ABOUT_HTML = """
+<div class="card">
+    <div style="text-align:center; margin-bottom:30px;">
+        <div style="width:80px; height:80px; background:linear-gradient(45deg, #4361ee, #4cc9f0, #f72585); border-radius:50%; display:flex; align-items:center; justify-content:center; margin:0 auto 20px; box-shadow:0 8px 25px rgba(76, 201, 240, 0.4);">
+            <span style="font-size:32px;">🧠</span>
+        </div>
+        <h2 style="color:#4cc9f0; margin-bottom:10px; font-size:2rem; font-weight:800;">How This Tool Works</h2>
+        <p style="color:#a0aec0; font-size:1.1rem;">Advanced AI-powered institutional level detection</p>
+    </div>
+
+    <div style="display:grid; grid-template-columns:1fr 1fr; gap:20px; margin-bottom:30px;">
+        <div style="background:linear-gradient(135deg, rgba(76, 201, 240, 0.1) 0%, rgba(67, 97, 238, 0.05) 100%); padding:20px; border-radius:15px; border:1px solid rgba(76, 201, 240, 0.2);">
+            <div style="display:flex; align-items:center; gap:10px; margin-bottom:15px;">
+                <div style="width:30px; height:30px; background:linear-gradient(45deg, #4361ee, #4cc9f0); border-radius:50%; display:flex; align-items:center; justify-content:center;">
+                    <span style="font-size:14px;">📈</span>
+                </div>
+                <h4 style="color:#4cc9f0; margin:0; font-weight:700;">Swing High Detection</h4>
+            </div>
+            <p style="color:#a0aec0; margin:0;">Finds candles with the highest high in a defined window</p>
+        </div>
+
+        <div style="background:linear-gradient(135deg, rgba(247, 37, 133, 0.1) 0%, rgba(67, 97, 238, 0.05) 100%); padding:20px; border-radius:15px; border:1px solid rgba(247, 37, 133, 0.2);">
+            <div style="display:flex; align-items:center; gap:10px; margin-bottom:15px;">
+                <div style="width:30px; height:30px; background:linear-gradient(45deg, #f72585, #4361ee); border-radius:50%; display:flex; align-items:center; justify-content:center;">
+                    <span style="font-size:14px;">📉</span>
+                </div>
+                <h4 style="color:#f72585; margin:0; font-weight:700;">Swing Low Detection</h4>
+            </div>
+            <p style="color:#a0aec0; margin:0;">Finds candles with the lowest low in a defined window</p>
+        </div>
+
+        <div style="background:linear-gradient(135deg, rgba(76, 201, 240, 0.1) 0%, rgba(67, 97, 238, 0.05) 100%); padding:20px; border-radius:15px; border:1px solid rgba(76, 201, 240, 0.2);">
+            <div style="display:flex; align-items:center; gap:10px; margin-bottom:15px;">
+                <div style="width:30px; height:30px; background:linear-gradient(45deg, #4361ee, #4cc9f0); border-radius:50%; display:flex; align-items:center; justify-content:center;">
+                    <span style="font-size:14px;">🎯</span>
+                </div>
+                <h4 style="color:#4cc9f0; margin:0; font-weight:700;">Significance Filter</h4>
+            </div>
+            <p style="color:#a0aec0; margin:0;">Only levels that haven't been broken by prior price action</p>
+        </div>
+
+        <div style="background:linear-gradient(135deg, rgba(247, 37, 133, 0.1) 0%, rgba(67, 97, 238, 0.05) 100%); padding:20px; border-radius:15px; border:1px solid rgba(247, 37, 133, 0.2);">
+            <div style="display:flex; align-items:center; gap:10px; margin-bottom:15px;">
+                <div style="width:30px; height:30px; background:linear-gradient(45deg, #f72585, #4361ee); border-radius:50%; display:flex; align-items:center; justify-content:center;">
+                    <span style="font-size:14px;">🔍</span>
+                </div>
+                <h4 style="color:#f72585; margin:0; font-weight:700;">Cluster Detection</h4>
+            </div>
+            <p style="color:#a0aec0; margin:0;">Groups nearby levels into significant zones</p>
+        </div>
+    </div>
+
+    <div style="background:linear-gradient(135deg, rgba(67, 97, 238, 0.1) 0%, rgba(76, 201, 240, 0.05) 100%); padding:25px; border-radius:15px; border:1px solid rgba(67, 97, 238, 0.2); margin-bottom:30px;">
+        <h3 style="color:#4cc9f0; margin-bottom:20px; font-size:1.5rem; font-weight:700;">🎯 How to Use These Levels</h3>
+        <div style="display:grid; grid-template-columns:1fr 1fr; gap:20px;">
+            <div>
+                <h4 style="color:#4cc9f0; margin-bottom:10px; font-weight:600;">Support Levels</h4>
+                <p style="color:#a0aec0; margin:0;">Price areas where buying interest is strong enough to overcome selling pressure</p>
+            </div>
+            <div>
+                <h4 style="color:#f72585; margin-bottom:10px; font-weight:600;">Resistance Levels</h4>
+                <p style="color:#a0aec0; margin:0;">Price areas where selling pressure overcomes buying interest</p>
+            </div>
+        </div>
+    </div>
+
+    <div style="background:linear-gradient(135deg, rgba(76, 201, 240, 0.1) 0%, rgba(67, 97, 238, 0.05) 100%); padding:25px; border-radius:15px; border:1px solid rgba(76, 201, 240, 0.2); margin-bottom:30px;">
+        <h3 style="color:#4cc9f0; margin-bottom:20px; font-size:1.5rem; font-weight:700;">⚙️ Parameter Guidance</h3>
+        <div style="display:grid; grid-template-columns:1fr 1fr; gap:20px;">
+            <div>
+                <h4 style="color:#4cc9f0; margin-bottom:10px; font-weight:600;">Left/Right Candles</h4>
+                <p style="color:#a0aec0; margin:0;">Determines sensitivity of level detection. Higher values find stronger, more significant levels.</p>
+            </div>
+            <div>
+                <h4 style="color:#f72585; margin-bottom:10px; font-weight:600;">Timeframe</h4>
+                <p style="color:#a0aec0; margin:0;">Higher timeframes show more significant levels. Use multiple timeframes for confirmation.</p>
+            </div>
+        </div>
+    </div>
+
+    <div style="background:linear-gradient(135deg, rgba(247, 37, 133, 0.1) 0%, rgba(67, 97, 238, 0.05) 100%); padding:25px; border-radius:15px; border:1px solid rgba(247, 37, 133, 0.2);">
+        <h3 style="color:#f72585; margin-bottom:20px; font-size:1.5rem; font-weight:700;">📊 Supported Assets</h3>
+        <div style="display:grid; grid-template-columns:repeat(auto-fit, minmax(200px, 1fr)); gap:15px;">
+            <div style="background:rgba(67, 97, 238, 0.1); padding:12px; border-radius:8px; border:1px solid rgba(67, 97, 238, 0.2);">
+                <span style="color:#4cc9f0; font-weight:600;">💎 Cryptocurrencies</span><br>
+                <span style="color:#a0aec0; font-size:0.9rem;">Bitcoin, Ethereum, etc.</span>
+            </div>
+            <div style="background:rgba(76, 201, 240, 0.1); padding:12px; border-radius:8px; border:1px solid rgba(76, 201, 240, 0.2);">
+                <span style="color:#4cc9f0; font-weight:600;">🥇 Precious Metals</span><br>
+                <span style="color:#a0aec0; font-size:0.9rem;">Gold, Silver, etc.</span>
+            </div>
+            <div style="background:rgba(247, 37, 133, 0.1); padding:12px; border-radius:8px; border:1px solid rgba(247, 37, 133, 0.2);">
+                <span style="color:#f72585; font-weight:600;">⛽ Energy</span><br>
+                <span style="color:#a0aec0; font-size:0.9rem;">Oil, Gas, etc.</span>
+            </div>
+            <div style="background:rgba(67, 97, 238, 0.1); padding:12px; border-radius:8px; border:1px solid rgba(67, 97, 238, 0.2);">
+                <span style="color:#4cc9f0; font-weight:600;">💱 Forex</span><br>
+                <span style="color:#a0aec0; font-size:0.9rem;">EUR/USD, USD/JPY, etc.</span>
+            </div>
+            <div style="background:rgba(76, 201, 240, 0.1); padding:12px; border-radius:8px; border:1px solid rgba(76, 201, 240, 0.2);">
+                <span style="color:#4cc9f0; font-weight:600;">📈 Indices</span><br>
+                <span style="color:#a0aec0; font-size:0.9rem;">S&P 500, NASDAQ, etc.</span>
+            </div>
+            <div style="background:rgba(247, 37, 133, 0.1); padding:12px; border-radius:8px; border:1px solid rgba(247, 37, 133, 0.2);">
+                <span style="color:#f72585; font-weight:600;">📊 Stocks</span><br>
+                <span style="color:#a0aec0; font-size:0.9rem;">Apple, Tesla, etc.</span>
+            </div>
+        </div>
+    </div>
+</div>
+"""
+
+# Static get-started markup
+GET_STARTED_HTML = """
+<div style="text-align:center; margin-top:100px;">
+    <h3 style="color:#4cc9f0;">🚀 Get Started</h3>
+    <p>Configure your analysis parameters in the sidebar and click "Run Smart Analysis"</p>
+    <div style="margin:30px;">
+        <svg width="200" height="200" viewBox="0 0 24 24" fill="none" xmlns="http://www.w3.org/2000/svg">
+            <path d="M12 2V6" stroke="#4cc9f0" stroke-width="1.5" stroke-linecap="round"/>
+            <path d="M12 18V22" stroke="#4cc9f0" stroke-width="1.5" stroke-linecap="round"/>
+            <path d="M5 12H2" stroke="#4cc9f0" stroke-width="1.5" stroke-linecap="round"/>
+            <path d="M22 12H19" stroke="#4cc9f0" stroke-width="1.5" stroke-linecap="round"/>
+            <path d="M4.92871 4.92871L7.75736 7.75736" stroke="#4361ee" stroke-width="1.5" stroke-linecap="round"/>
+            <path d="M16.2426 16.2426L19.0713 19.0713" stroke="#4361ee" stroke-width="1.5" stroke-linecap="round"/>
+            <path d="M4.92871 19.0713L7.75736 16.2426" stroke="#f72585" stroke-width="1.5" stroke-linecap="round"/>
+            <path d="M16.2426 7.75736L19.0713 4.92871" stroke="#f72585" stroke-width="1.5" stroke-linecap="round"/>
+            <circle cx="12" cy="12" r="3" stroke="#4cc9f0" stroke-width="1.5"/>
+        </svg>
+    </div>
+    <p><i>Detect institutional trading levels across multiple asset classes</i></p>
+</div>
+"""
+
+# Static footer markup
+FOOTER_HTML = """
+<div style="text-align:center; padding:30px; background:linear-gradient(135deg, rgba(10, 15, 35, 0.8) 0%, rgba(67, 97, 238, 0.1) 100%); border-radius:20px; border:1px solid rgba(76, 201, 240, 0.2); margin-top:40px;">
+    <div style="display:flex; justify-content:center; align-items:center; gap:20px; margin-bottom:20px;">
+        <div style="width:40px; height:40px; background:linear-gradient(45deg, #4361ee, #4cc9f0); border-radius:50%; display:flex; align-items:center; justify-content:center; box-shadow:0 4px 15px rgba(76, 201, 240, 0.4);">
+            <span style="font-size:18px;">📊</span>
+        </div>
+        <h3 style="color:#4cc9f0; margin:0; font-weight:700; font-size:1.3rem;">Smart Money S/R Finder Pro</h3>
+        <div style="width:40px; height:40px; background:linear-gradient(45deg, #f72585, #4361ee); border-radius:50%; display:flex; align-items:center; justify-content:center; box-shadow:0 4px 15px rgba(247, 37, 133, 0.4);">
+            <span style="font-size:18px;">⚡</span>
+        </div>
+    </div>
+    <div style="display:flex; justify-content:center; gap:30px; margin-bottom:20px; flex-wrap:wrap;">
+        <span style="background:rgba(76, 201, 240, 0.2); padding:8px 16px; border-radius:20px; font-size:0.9rem; color:#4cc9f0; border:1px solid rgba(76, 201, 240, 0.3);">📈 Real-time Analysis</span>
+        <span style="background:rgba(247, 37, 133, 0.2); padding:8px 16px; border-radius:20px; font-size:0.9rem; color:#f72585; border:1px solid rgba(247, 37, 133, 0.3);">🎯 Smart Detection</span>
+        <span style="background:rgba(67, 97, 238, 0.2); padding:8px 16px; border-radius:20px; font-size:0.9rem; color:#4361ee; border:1px solid rgba(67, 97, 238, 0.3);">⚡ Fast Processing</span>
+    </div>
+    <p style="color:#a0aec0; font-size:1rem; margin-bottom:10px; font-weight:500;">Data from Yahoo Finance • Advanced institutional level detection</p>
+    <p style="color:#a0aec0; font-size:0.9rem; margin:0; opacity:0.8;">⚠️ Note: This is for educational purposes only. Past performance is not indicative of future results.</p>
+</div>
+"""
+
+# --- Page Configuration ---
+# (Removed duplicate st.set_page_config block here)
+
+# --- Enhanced Header ---
+st.markdown(HEADER_HTML, unsafe_allow_html=True)
 
 # --- Enhanced Sidebar for Inputs ---
 with st.sidebar:
@@ -756,8 +689,7 @@ with st.sidebar:
                     help="Number of candles to the right to compare")
     
     # Calculate coverage info
-    time_multipliers = {'1m': 1, '5m': 5, '15m': 15, '30m': 30, '1h': 60, '4h': 240}
-    coverage_minutes = (left + right + 1) * time_multipliers.get(interval, 60)
+    coverage_minutes = (left + right + 1) * TIMEFRAME_MINUTES.get(interval, 60)
     coverage_hours = coverage_minutes / 60
     
     st.markdown(f"""
@@ -802,6 +734,8 @@ if 'run_analysis' not in st.session_state:
 
 # --- Main Analysis Section ---
 if st.session_state.run_analysis:
+    # One analysis per click; later reruns only redisplay the stored results
+    st.session_state.run_analysis = False
     start_dt = datetime.combine(start_date, start_time)
     end_dt = datetime.combine(end_date, end_time)
     
@@ -813,11 +747,16 @@ if st.session_state.run_analysis:
         start_utc, end_utc = to_tehran_utc(start_dt, end_dt)
         
         # Download data
-        df = download_data(symbol, start_utc, end_utc, interval, auto_adjust)
-        
+        df, missing = download_data(symbol, start_utc, end_utc, interval, auto_adjust)
+        if missing:
+            # Keep a partial range out of the cache so the next run fetches it again
+            download_data.clear(symbol, start_utc, end_utc, interval, auto_adjust)
+            gaps = ', '.join(f"{s.tz_convert(TEHRAN_TZ):%Y-%m-%d %H:%M} → {e.tz_convert(TEHRAN_TZ):%Y-%m-%d %H:%M}" for s, e in missing)
+            st.warning(f"⚠️ No candles were returned for {gaps}; the range may be incomplete")
+
         # Run analysis
         with st.spinner('🔍 Detecting smart money levels...'):
-            fig, df_blocks = plot_smart_money_sr(
+            fig_json, df_blocks = plot_smart_money_sr(
                 symbol=symbol,
                 df=df,
                 interval=interval,
@@ -825,16 +764,21 @@ if st.session_state.run_analysis:
                 right=right
             )
             
-            # Store results in session state
-            st.session_state.fig = fig
+            # Store results in session state; the Figure is rebuilt from JSON once
+            # here so reruns hand st.plotly_chart a Figure it need not revalidate
+            import plotly.io as pio
+            st.session_state.fig = pio.from_json(fig_json)
             st.session_state.df_blocks = df_blocks
+            st.session_state.table_html = levels_table_html(df_blocks)
+            st.session_state.csv_bytes = df_blocks.to_csv(index=False).encode('utf-8')
+            st.session_state.level_counts = df_blocks['Type'].value_counts()
             st.session_state.symbol = symbol
             st.session_state.symbol_name = symbol_name
             st.session_state.interval = interval
+            st.session_state.bar_count = len(df)
             
     except Exception as e:
         st.error(f"❌ Error in analysis: {str(e)}")
-        st.session_state.run_analysis = False
 
 # --- Display Results ---
 if st.session_state.fig is not None:
@@ -842,11 +786,17 @@ if st.session_state.fig is not None:
     
     with tab1:
         st.plotly_chart(st.session_state.fig, use_container_width=True, config=CONFIG)
+        if st.session_state.bar_count > MAX_CANDLES:
+            st.caption(
+                f"⚡ Chart downsampled from {st.session_state.bar_count:,} to {MAX_CANDLES:,} candles "
+                "for performance; levels are detected on the full-resolution data."
+            )
         
         # Market summary metrics
         if not st.session_state.df_blocks.empty:
-            support_count = len(st.session_state.df_blocks[st.session_state.df_blocks['Type'] == 'Support'])
-            resistance_count = len(st.session_state.df_blocks[st.session_state.df_blocks['Type'] == 'Resistance'])
+            counts = st.session_state.level_counts
+            support_count = int(counts.get('Support', 0))
+            resistance_count = int(counts.get('Resistance', 0))
             
             col1, col2, col3, col4 = st.columns(4)
             col1.metric("Total Support Levels", support_count)
@@ -858,25 +808,13 @@ if st.session_state.fig is not None:
         if not st.session_state.df_blocks.empty:
             st.subheader("📋 Detected Support & Resistance Levels")
             
-            # Format table
-            df_display = st.session_state.df_blocks.copy()
-            df_display['Price'] = df_display['Price'].apply(lambda x: f"{x:.2f}")
-            
-            # Show interactive table
-            st.dataframe(
-                df_display.style
-                .applymap(lambda x: 'background-color: rgba(76, 201, 240, 0.2)' if x == 'Support' 
-                          else 'background-color: rgba(247, 37, 133, 0.2)', subset=['Type'])
-                .set_properties(**{'color': 'white', 'border': '1px solid #2d3741'}),
-                height=min(500, 45 + len(df_display) * 35),
-                use_container_width=True
-            )
+            # Show the precomputed levels table
+            st.markdown(st.session_state.table_html, unsafe_allow_html=True)
             
             # Download button
-            csv = st.session_state.df_blocks.to_csv(index=False).encode('utf-8')
             st.download_button(
                 label="💾 Download as CSV",
-                data=csv,
+                data=st.session_state.csv_bytes,
                 file_name=f"{st.session_state.symbol}_{st.session_state.interval}_smart_levels.csv",
                 mime="text/csv",
                 use_container_width=True
@@ -885,162 +823,14 @@ if st.session_state.fig is not None:
             st.warning("No support or resistance levels detected in the selected range")
     
     with tab3:
-        st.markdown("""
-        <div class="card">
-            <div style="text-align:center; margin-bottom:30px;">
-                <div style="width:80px; height:80px; background:linear-gradient(45deg, #4361ee, #4cc9f0, #f72585); border-radius:50%; display:flex; align-items:center; justify-content:center; margin:0 auto 20px; box-shadow:0 8px 25px rgba(76, 201, 240, 0.4);">
-                    <span style="font-size:32px;">🧠</span>
-                </div>
-                <h2 style="color:#4cc9f0; margin-bottom:10px; font-size:2rem; font-weight:800;">How This Tool Works</h2>
-                <p style="color:#a0aec0; font-size:1.1rem;">Advanced AI-powered institutional level detection</p>
-            </div>
-            
-            <div style="display:grid; grid-template-columns:1fr 1fr; gap:20px; margin-bottom:30px;">
-                <div style="background:linear-gradient(135deg, rgba(76, 201, 240, 0.1) 0%, rgba(67, 97, 238, 0.05) 100%); padding:20px; border-radius:15px; border:1px solid rgba(76, 201, 240, 0.2);">
-                    <div style="display:flex; align-items:center; gap:10px; margin-bottom:15px;">
-                        <div style="width:30px; height:30px; background:linear-gradient(45deg, #4361ee, #4cc9f0); border-radius:50%; display:flex; align-items:center; justify-content:center;">
-                            <span style="font-size:14px;">📈</span>
-                        </div>
-                        <h4 style="color:#4cc9f0; margin:0; font-weight:700;">Swing High Detection</h4>
-                    </div>
-                    <p style="color:#a0aec0; margin:0;">Finds candles with the highest high in a defined window</p>
-                </div>
-                
-                <div style="background:linear-gradient(135deg, rgba(247, 37, 133, 0.1) 0%, rgba(67, 97, 238, 0.05) 100%); padding:20px; border-radius:15px; border:1px solid rgba(247, 37, 133, 0.2);">
-                    <div style="display:flex; align-items:center; gap:10px; margin-bottom:15px;">
-                        <div style="width:30px; height:30px; background:linear-gradient(45deg, #f72585, #4361ee); border-radius:50%; display:flex; align-items:center; justify-content:center;">
-                            <span style="font-size:14px;">📉</span>
-                        </div>
-                        <h4 style="color:#f72585; margin:0; font-weight:700;">Swing Low Detection</h4>
-                    </div>
-                    <p style="color:#a0aec0; margin:0;">Finds candles with the lowest low in a defined window</p>
-                </div>
-                
-                <div style="background:linear-gradient(135deg, rgba(76, 201, 240, 0.1) 0%, rgba(67, 97, 238, 0.05) 100%); padding:20px; border-radius:15px; border:1px solid rgba(76, 201, 240, 0.2);">
-                    <div style="display:flex; align-items:center; gap:10px; margin-bottom:15px;">
-                        <div style="width:30px; height:30px; background:linear-gradient(45deg, #4361ee, #4cc9f0); border-radius:50%; display:flex; align-items:center; justify-content:center;">
-                            <span style="font-size:14px;">🎯</span>
-                        </div>
-                        <h4 style="color:#4cc9f0; margin:0; font-weight:700;">Significance Filter</h4>
-                    </div>
-                    <p style="color:#a0aec0; margin:0;">Only levels that haven't been broken by prior price action</p>
-                </div>
-                
-                <div style="background:linear-gradient(135deg, rgba(247, 37, 133, 0.1) 0%, rgba(67, 97, 238, 0.05) 100%); padding:20px; border-radius:15px; border:1px solid rgba(247, 37, 133, 0.2);">
-                    <div style="display:flex; align-items:center; gap:10px; margin-bottom:15px;">
-                        <div style="width:30px; height:30px; background:linear-gradient(45deg, #f72585, #4361ee); border-radius:50%; display:flex; align-items:center; justify-content:center;">
-                            <span style="font-size:14px;">🔍</span>
-                        </div>
-                        <h4 style="color:#f72585; margin:0; font-weight:700;">Cluster Detection</h4>
-                    </div>
-                    <p style="color:#a0aec0; margin:0;">Groups nearby levels into significant zones</p>
-                </div>
-            </div>
-            
-            <div style="background:linear-gradient(135deg, rgba(67, 97, 238, 0.1) 0%, rgba(76, 201, 240, 0.05) 100%); padding:25px; border-radius:15px; border:1px solid rgba(67, 97, 238, 0.2); margin-bottom:30px;">
-                <h3 style="color:#4cc9f0; margin-bottom:20px; font-size:1.5rem; font-weight:700;">🎯 How to Use These Levels</h3>
-                <div style="display:grid; grid-template-columns:1fr 1fr; gap:20px;">
-                    <div>
-                        <h4 style="color:#4cc9f0; margin-bottom:10px; font-weight:600;">Support Levels</h4>
-                        <p style="color:#a0aec0; margin:0;">Price areas where buying interest is strong enough to overcome selling pressure</p>
-                    </div>
-                    <div>
-                        <h4 style="color:#f72585; margin-bottom:10px; font-weight:600;">Resistance Levels</h4>
-                        <p style="color:#a0aec0; margin:0;">Price areas where selling pressure overcomes buying interest</p>
-                    </div>
-                </div>
-            </div>
-            
-            <div style="background:linear-gradient(135deg, rgba(76, 201, 240, 0.1) 0%, rgba(67, 97, 238, 0.05) 100%); padding:25px; border-radius:15px; border:1px solid rgba(76, 201, 240, 0.2); margin-bottom:30px;">
-                <h3 style="color:#4cc9f0; margin-bottom:20px; font-size:1.5rem; font-weight:700;">⚙️ Parameter Guidance</h3>
-                <div style="display:grid; grid-template-columns:1fr 1fr; gap:20px;">
-                    <div>
-                        <h4 style="color:#4cc9f0; margin-bottom:10px; font-weight:600;">Left/Right Candles</h4>
-                        <p style="color:#a0aec0; margin:0;">Determines sensitivity of level detection. Higher values find stronger, more significant levels.</p>
-                    </div>
-                    <div>
-                        <h4 style="color:#f72585; margin-bottom:10px; font-weight:600;">Timeframe</h4>
-                        <p style="color:#a0aec0; margin:0;">Higher timeframes show more significant levels. Use multiple timeframes for confirmation.</p>
-                    </div>
-                </div>
-            </div>
-            
-            <div style="background:linear-gradient(135deg, rgba(247, 37, 133, 0.1) 0%, rgba(67, 97, 238, 0.05) 100%); padding:25px; border-radius:15px; border:1px solid rgba(247, 37, 133, 0.2);">
-                <h3 style="color:#f72585; margin-bottom:20px; font-size:1.5rem; font-weight:700;">📊 Supported Assets</h3>
-                <div style="display:grid; grid-template-columns:repeat(auto-fit, minmax(200px, 1fr)); gap:15px;">
-                    <div style="background:rgba(67, 97, 238, 0.1); padding:12px; border-radius:8px; border:1px solid rgba(67, 97, 238, 0.2);">
-                        <span style="color:#4cc9f0; font-weight:600;">💎 Cryptocurrencies</span><br>
-                        <span style="color:#a0aec0; font-size:0.9rem;">Bitcoin, Ethereum, etc.</span>
-                    </div>
-                    <div style="background:rgba(76, 201, 240, 0.1); padding:12px; border-radius:8px; border:1px solid rgba(76, 201, 240, 0.2);">
-                        <span style="color:#4cc9f0; font-weight:600;">🥇 Precious Metals</span><br>
-                        <span style="color:#a0aec0; font-size:0.9rem;">Gold, Silver, etc.</span>
-                    </div>
-                    <div style="background:rgba(247, 37, 133, 0.1); padding:12px; border-radius:8px; border:1px solid rgba(247, 37, 133, 0.2);">
-                        <span style="color:#f72585; font-weight:600;">⛽ Energy</span><br>
-                        <span style="color:#a0aec0; font-size:0.9rem;">Oil, Gas, etc.</span>
-                    </div>
-                    <div style="background:rgba(67, 97, 238, 0.1); padding:12px; border-radius:8px; border:1px solid rgba(67, 97, 238, 0.2);">
-                        <span style="color:#4cc9f0; font-weight:600;">💱 Forex</span><br>
-                        <span style="color:#a0aec0; font-size:0.9rem;">EUR/USD, USD/JPY, etc.</span>
-                    </div>
-                    <div style="background:rgba(76, 201, 240, 0.1); padding:12px; border-radius:8px; border:1px solid rgba(76, 201, 240, 0.2);">
-                        <span style="color:#4cc9f0; font-weight:600;">📈 Indices</span><br>
-                        <span style="color:#a0aec0; font-size:0.9rem;">S&P 500, NASDAQ, etc.</span>
-                    </div>
-                    <div style="background:rgba(247, 37, 133, 0.1); padding:12px; border-radius:8px; border:1px solid rgba(247, 37, 133, 0.2);">
-                        <span style="color:#f72585; font-weight:600;">📊 Stocks</span><br>
-                        <span style="color:#a0aec0; font-size:0.9rem;">Apple, Tesla, etc.</span>
-                    </div>
-                </div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(ABOUT_HTML, unsafe_allow_html=True)
 
 # --- Info when no analysis run yet ---
 else:
     col1, col2, col3 = st.columns([1,2,1])
     with col2:
-        st.markdown("""
-        <div style="text-align:center; margin-top:100px;">
-            <h3 style="color:#4cc9f0;">🚀 Get Started</h3>
-            <p>Configure your analysis parameters in the sidebar and click "Run Smart Analysis"</p>
-            <div style="margin:30px;">
-                <svg width="200" height="200" viewBox="0 0 24 24" fill="none" xmlns="http://www.w3.org/2000/svg">
-                    <path d="M12 2V6" stroke="#4cc9f0" stroke-width="1.5" stroke-linecap="round"/>
-                    <path d="M12 18V22" stroke="#4cc9f0" stroke-width="1.5" stroke-linecap="round"/>
-                    <path d="M5 12H2" stroke="#4cc9f0" stroke-width="1.5" stroke-linecap="round"/>
-                    <path d="M22 12H19" stroke="#4cc9f0" stroke-width="1.5" stroke-linecap="round"/>
-                    <path d="M4.92871 4.92871L7.75736 7.75736" stroke="#4361ee" stroke-width="1.5" stroke-linecap="round"/>
-                    <path d="M16.2426 16.2426L19.0713 19.0713" stroke="#4361ee" stroke-width="1.5" stroke-linecap="round"/>
-                    <path d="M4.92871 19.0713L7.75736 16.2426" stroke="#f72585" stroke-width="1.5" stroke-linecap="round"/>
-                    <path d="M16.2426 7.75736L19.0713 4.92871" stroke="#f72585" stroke-width="1.5" stroke-linecap="round"/>
-                    <circle cx="12" cy="12" r="3" stroke="#4cc9f0" stroke-width="1.5"/>
-                </svg>
-            </div>
-            <p><i>Detect institutional trading levels across multiple asset classes</i></p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(GET_STARTED_HTML, unsafe_allow_html=True)
 
 # --- Enhanced Footer ---
 st.markdown("---")
-st.markdown("""
-<div style="text-align:center; padding:30px; background:linear-gradient(135deg, rgba(10, 15, 35, 0.8) 0%, rgba(67, 97, 238, 0.1) 100%); border-radius:20px; border:1px solid rgba(76, 201, 240, 0.2); margin-top:40px;">
-    <div style="display:flex; justify-content:center; align-items:center; gap:20px; margin-bottom:20px;">
-        <div style="width:40px; height:40px; background:linear-gradient(45deg, #4361ee, #4cc9f0); border-radius:50%; display:flex; align-items:center; justify-content:center; box-shadow:0 4px 15px rgba(76, 201, 240, 0.4);">
-            <span style="font-size:18px;">📊</span>
-        </div>
-        <h3 style="color:#4cc9f0; margin:0; font-weight:700; font-size:1.3rem;">Smart Money S/R Finder Pro</h3>
-        <div style="width:40px; height:40px; background:linear-gradient(45deg, #f72585, #4361ee); border-radius:50%; display:flex; align-items:center; justify-content:center; box-shadow:0 4px 15px rgba(247, 37, 133, 0.4);">
-            <span style="font-size:18px;">⚡</span>
-        </div>
-    </div>
-    <div style="display:flex; justify-content:center; gap:30px; margin-bottom:20px; flex-wrap:wrap;">
-        <span style="background:rgba(76, 201, 240, 0.2); padding:8px 16px; border-radius:20px; font-size:0.9rem; color:#4cc9f0; border:1px solid rgba(76, 201, 240, 0.3);">📈 Real-time Analysis</span>
-        <span style="background:rgba(247, 37, 133, 0.2); padding:8px 16px; border-radius:20px; font-size:0.9rem; color:#f72585; border:1px solid rgba(247, 37, 133, 0.3);">🎯 Smart Detection</span>
-        <span style="background:rgba(67, 97, 238, 0.2); padding:8px 16px; border-radius:20px; font-size:0.9rem; color:#4361ee; border:1px solid rgba(67, 97, 238, 0.3);">⚡ Fast Processing</span>
-    </div>
-    <p style="color:#a0aec0; font-size:1rem; margin-bottom:10px; font-weight:500;">Data from Yahoo Finance • Advanced institutional level detection</p>
-    <p style="color:#a0aec0; font-size:0.9rem; margin:0; opacity:0.8;">⚠️ Note: This is for educational purposes only. Past performance is not indicative of future results.</p>
-</div>
-""", unsafe_allow_html=True)
+st.markdown(FOOTER_HTML, unsafe_allow_html=True)
@@ -0,0 +1,73 @@
+import os
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+
+import pandas as pd
+
+
+def read_cached_frame(path: Path):
+    """Load a stored OHLC frame, or None if it is missing or unreadable."""
+    try:
+        return pd.read_parquet(path)
+    except Exception:
+        return None
+
+def write_cached_frame(path: Path, df: pd.DataFrame):
+    """Store an OHLC frame, replacing the file atomically; failures are ignored."""
+    # Sessions share the store, so readers must never see a half-written file
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        os.close(fd)
+    except OSError:
+        return
+    try:
+        df.to_parquet(tmp)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+    finally:
+        Path(tmp).unlink(missing_ok=True)
+
+def load_range(path: Path, start, end, fetch, candle_minutes: int, now=None):
+    """
+    Return the candles in [start, end) and the requested spans that came back empty.
+    The store at path records the span it covers in attrs['covered']; only the parts
+    of the range outside it are downloaded, one fetch(start, end) call per span.
+    """
+    stored = read_cached_frame(path)
+    spans = [(start, end)]
+    missing = []
+    start_cov = end_cov = None
+    if stored is not None and 'covered' in stored.attrs:
+        lo, hi = (pd.Timestamp(t) for t in stored.attrs['covered'])
+        if start <= hi and end >= lo:
+            spans = [(s, e) for s, e in ((start, lo), (hi, end)) if s < e]
+            start_cov, end_cov = lo, hi
+        else:
+            stored = None
+    else:
+        stored = None
+
+    if spans:
+        parts = [fetch(s, e) for s, e in spans]
+        # Only spans that came back with rows join the covered span; empty ones are
+        # reported to the caller and retried on the next download
+        fetched = [(s, e) for (s, e), part in zip(spans, parts) if not part.empty]
+        missing = [(s, e) for (s, e), part in zip(spans, parts) if part.empty]
+        if fetched:
+            for s, e in fetched:
+                start_cov = s if start_cov is None else min(start_cov, s)
+                end_cov = e if end_cov is None else max(end_cov, e)
+            stored = pd.concat([f for f in [stored, *parts] if f is not None and not f.empty])
+            stored = stored[~stored.index.duplicated(keep='last')].sort_index()
+            # The newest candle may still be forming; leave it out of the covered span
+            now = pd.Timestamp.now(tz='UTC') if now is None else now
+            settled = now - timedelta(minutes=candle_minutes)
+            end_cov = max(start_cov, min(end_cov, settled))
+            stored.attrs['covered'] = [start_cov.isoformat(), end_cov.isoformat()]
+            write_cached_frame(path, stored)
+
+    df = stored[(stored.index >= start) & (stored.index < end)] if stored is not None else pd.DataFrame()
+    return df, missing
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from analysis_kernel import assign_levels, detect_swings
+
+
+def reference_blocks(highs, lows, left, right):
+    """The original list-comprehension swing scan and prior-extreme filter."""
+    swing_highs = [i for i in range(left, len(highs) - right) if highs[i] == highs[i-left:i+right+1].max()]
+    swing_lows = [i for i in range(left, len(lows) - right) if lows[i] == lows[i-left:i+right+1].min()]
+    resistance = [i for i in swing_highs if i > 0 and np.max(highs[:i]) > highs[i]]
+    support = [i for i in swing_lows if i > 0 and np.min(lows[:i]) < lows[i]]
+    return swing_highs, swing_lows, resistance, support
+
+
+def reference_levels(prices, tolerance):
+    """The original clustering loop: join the first level seeded within tolerance."""
+    levels = {}
+    labels = []
+    for price in prices:
+        for number, level in enumerate(levels):
+            if abs(level - price) < tolerance:
+                labels.append(number)
+                break
+        else:
+            levels[price] = len(levels)
+            labels.append(len(levels) - 1)
+    return labels
+
+
+def tie_heavy_series(rng, n, dtype):
+    """Random walk rounded to one decimal so equal highs/lows are common."""
+    closes = np.round(100 + np.cumsum(rng.normal(0, 0.3, n)), 1)
+    highs = closes + np.round(rng.uniform(0, 0.3, n), 1)
+    lows = closes - np.round(rng.uniform(0, 0.3, n), 1)
+    return highs.astype(dtype), lows.astype(dtype)
+
+
+@pytest.mark.parametrize('dtype', [np.float32, np.float64])
+@pytest.mark.parametrize('left,right', [(4, 4), (1, 1), (2, 5), (6, 3), (20, 1)])
+def test_detect_swings_matches_reference(dtype, left, right):
+    rng = np.random.default_rng(left * 31 + right)
+    for n in [0, 1, left + right, left + right + 1, 50, 400]:
+        highs, lows = tie_heavy_series(rng, n, dtype)
+        swing_highs, swing_lows, resistance, support = reference_blocks(highs, lows, left, right)
+
+        high_idx, high_mask = detect_swings(highs, left, right, True)
+        low_idx, low_mask = detect_swings(lows, left, right, False)
+
+        assert high_idx.tolist() == swing_highs
+        assert low_idx.tolist() == swing_lows
+        assert high_idx[high_mask].tolist() == resistance
+        assert low_idx[low_mask].tolist() == support
+
+
+def test_detect_swings_flat_series():
+    values = np.full(30, 5.0)
+    swings, mask = detect_swings(values, 3, 2, True)
+    assert swings.tolist() == list(range(3, 28))
+    assert not mask.any()
+
+
+def test_detect_swings_accepts_read_only_arrays():
+    values = np.array([1.0, 3.0, 2.0, 5.0, 4.0, 6.0, 1.0])
+    values.flags.writeable = False
+    swings, mask = detect_swings(values, 1, 1, True)
+    assert swings.tolist() == [1, 3, 5]
+    assert mask.tolist() == [False, False, False]
+
+
+@pytest.mark.parametrize('dtype', [np.float32, np.float64])
+@pytest.mark.parametrize('tolerance', [0.05, 0.5, 1.0, 3.0])
+def test_assign_levels_matches_reference(dtype, tolerance):
+    rng = np.random.default_rng(int(tolerance * 100))
+    for n in [0, 1, 2, 30, 300]:
+        prices = np.round(100 + np.cumsum(rng.normal(0, 1, n)), 1).astype(dtype)
+        expected = reference_levels(prices.astype(np.float64).tolist(), tolerance)
+        assert assign_levels(prices, tolerance).tolist() == expected
+
+
+def test_assign_levels_zone_spans_both_sides_of_seed():
+    # Both neighbours of the seed are within tolerance, so one zone twice the tolerance wide
+    labels = assign_levels(np.array([100.0, 100.9, 99.1, 101.0]), 1.0)
+    assert labels.tolist() == [0, 0, 0, 1]
+
+
+def test_assign_levels_prefers_earliest_seed():
+    # 101.0 is within tolerance of both seeds; the one created first wins
+    labels = assign_levels(np.array([101.8, 100.2, 101.0]), 1.0)
+    assert labels.tolist() == [0, 1, 0]
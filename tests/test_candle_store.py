@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from candle_store import load_range
+
+T0 = pd.Timestamp('2026-10-01 00:00', tz='UTC')
+FAR = T0 + pd.Timedelta(days=365)
+
+
+def hour(n):
+    return T0 + pd.Timedelta(hours=n)
+
+
+class FakeFetch:
+    """Hourly candles derived from their timestamps, so any split of a range agrees."""
+
+    def __init__(self, now=FAR, fail=()):
+        self.now = now
+        self.fail = set(fail)
+        self.calls = []
+
+    def __call__(self, start, end):
+        self.calls.append((start, end))
+        if (start, end) in self.fail:
+            return pd.DataFrame()
+        idx = pd.date_range(start.ceil('h'), end, freq='h', inclusive='left')
+        idx = idx[idx < self.now]
+        price = 100 + np.sin(idx.asi8 / 3.6e12)
+        return pd.DataFrame({'Open': price, 'High': price + 1, 'Low': price - 1, 'Close': price}, index=idx)
+
+
+def covered(path):
+    return [pd.Timestamp(t) for t in pd.read_parquet(path).attrs['covered']]
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / 'BTC-USD' / '1h_adj.parquet'
+
+
+def test_request_inside_covered_span_does_not_fetch(path):
+    load_range(path, hour(0), hour(10), FakeFetch(), 60, now=FAR)
+    fetch = FakeFetch()
+    df, missing = load_range(path, hour(2), hour(8), fetch, 60, now=FAR)
+    assert fetch.calls == []
+    assert missing == []
+    assert list(df.index) == [hour(n) for n in range(2, 8)]
+
+
+def test_head_and_tail_fetch_only_the_missing_spans(path, tmp_path):
+    load_range(path, hour(3), hour(6), FakeFetch(), 60, now=FAR)
+    fetch = FakeFetch()
+    df, missing = load_range(path, hour(0), hour(10), fetch, 60, now=FAR)
+    assert fetch.calls == [(hour(0), hour(3)), (hour(6), hour(10))]
+    assert missing == []
+    assert covered(path) == [hour(0), hour(10)]
+
+    full, _ = load_range(tmp_path / 'fresh.parquet', hour(0), hour(10), FakeFetch(), 60, now=FAR)
+    pd.testing.assert_frame_equal(df, full, check_freq=False)
+
+
+def test_failed_tail_keeps_covered_span_and_is_retried(path):
+    load_range(path, hour(0), hour(5), FakeFetch(), 60, now=FAR)
+    fetch = FakeFetch(fail=[(hour(5), hour(8))])
+    df, missing = load_range(path, hour(2), hour(8), fetch, 60, now=FAR)
+    assert missing == [(hour(5), hour(8))]
+    assert covered(path) == [hour(0), hour(5)]
+    assert list(df.index) == [hour(n) for n in range(2, 5)]
+
+    fetch = FakeFetch()
+    df, missing = load_range(path, hour(2), hour(8), fetch, 60, now=FAR)
+    assert fetch.calls == [(hour(5), hour(8))]
+    assert missing == []
+    assert covered(path) == [hour(0), hour(8)]
+
+
+def test_disjoint_request_resets_the_store(path):
+    load_range(path, hour(0), hour(3), FakeFetch(), 60, now=FAR)
+    fetch = FakeFetch()
+    df, missing = load_range(path, hour(10), hour(12), fetch, 60, now=FAR)
+    assert fetch.calls == [(hour(10), hour(12))]
+    assert covered(path) == [hour(10), hour(12)]
+    assert pd.read_parquet(path).index.min() == hour(10)
+
+
+def test_forming_candle_stays_outside_covered_span(path):
+    now = hour(10) + pd.Timedelta(minutes=30)
+    df, _ = load_range(path, hour(0), hour(11), FakeFetch(now=now), 60, now=now)
+    assert df.index[-1] == hour(10)
+    assert covered(path) == [hour(0), now - pd.Timedelta(minutes=60)]
+
+    fetch = FakeFetch(now=now)
+    load_range(path, hour(0), hour(11), fetch, 60, now=now)
+    assert fetch.calls == [(now - pd.Timedelta(minutes=60), hour(11))]
+
+
+def test_store_is_replaced_without_leaving_temp_files(path):
+    load_range(path, hour(0), hour(3), FakeFetch(), 60, now=FAR)
+    load_range(path, hour(0), hour(6), FakeFetch(), 60, now=FAR)
+    assert [p.name for p in path.parent.iterdir()] == [path.name]